@@ -2,20 +2,65 @@
 Rahalah Trip Planning Assistant - Streamlit Frontend
 A simplified but powerful UI for the Rahalah Trip Planning system.
 """
+import asyncio
+import collections
+import html
 import json
 import os
-import requests
-from typing import Dict, List, Optional, Any, Union, Tuple
+import threading
+import time
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Any, Union, Tuple
 
+import aiohttp
 import streamlit as st
 from dotenv import load_dotenv
 
+# orjson is an optional speedup; fall back to the standard library without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
 # Configuration
 API_URL = "http://localhost:8000"
 DEFAULT_MODE = "trip"
+MODES = ("trip", "flight", "hotel")
+MODE_INDEX = {mode: i for i, mode in enumerate(MODES)}
+STREAM_FLUSH_MS = 80  # Max time to buffer streamed chunks before rendering
+STREAM_FLUSH_CHUNKS = 8  # Max number of streamed chunks per render
+DEBUG_LOG_SIZE = 200  # Max number of debug log entries kept per session
+DEBUG_LOG_SHOWN = 50  # Number of most recent debug log entries shown by default
+RESPONSE_CACHE_TTL = 60  # Seconds a cached assistant response stays valid
+RESPONSE_CACHE_SIZE = 128  # Max number of cached assistant responses per session
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize an object to JSON bytes, using orjson when available.
+    
+    Args:
+        obj: The object to serialize
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+def _json_loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON, using orjson when available.
+    
+    Args:
+        data: The JSON document
+        
+    Returns:
+        The parsed object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 # Set page configuration
 st.set_page_config(
@@ -25,8 +70,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Define custom CSS
-st.markdown("""
+# Custom CSS, injected at the start of every run
+_CSS = """
 <style>
     .main {
         background-color: #f5f7f9;
@@ -96,25 +141,141 @@ st.markdown("""
         margin-bottom: 2rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Sample queries offered in the sidebar for each mode
+SAMPLE_QUERIES_BY_MODE = {
+    "trip": (
+        "Plan a 7-day trip to Riyadh",
+        "What's a good itinerary for a weekend in Jeddah?",
+        "Suggest activities for a family vacation in Mecca"
+    ),
+    "flight": (
+        "Find flights from Riyadh to Jeddah next weekend",
+        "What are the cheapest flights to Madinah in July?",
+        "Show me business class options from Riyadh to Dubai"
+    ),
+    "hotel": (
+        "Find hotels in Riyadh near Kingdom Centre",
+        "What are the best 5-star hotels in Jeddah?",
+        "Show me family-friendly accommodations in Mecca"
+    )
+}
+
+# Welcome message shown for each mode before the first message
+WELCOME = {
+    "trip": "Welcome to Rahalah! Ask me to plan a trip for you, and I'll help with flights, hotels, and places to visit.",
+    "flight": "Welcome to Rahalah Flight Search! Tell me where you want to fly from and to, and I'll find the best options.",
+    "hotel": "Welcome to Rahalah Hotel Search! Tell me where you're looking to stay, and I'll find great accommodation options."
+}
+
+def _inject_css() -> None:
+    """Inject the custom CSS into the page.
+    
+    Streamlit drops any element a run does not emit again, so this has to
+    be called on every run rather than cached.
+    """
+    st.markdown(_CSS, unsafe_allow_html=True)
+
+# Star strings for every rating in half-star steps, keyed by rating * 2
+_STAR_TABLE = {i: ("★" * (i // 2)) + ("½" if i % 2 else "") for i in range(0, 11)}
 
 def display_stars(rating: float) -> str:
     """Convert a numerical rating to star symbols.
     
     Args:
-        rating: The numerical rating (typically 1-5)
+        rating: The numerical rating (typically 1-5, clamped to 0-5)
         
     Returns:
         String of star symbols
     """
-    full_stars = int(rating)
-    half_star = rating - full_stars >= 0.5
+    return _STAR_TABLE.get(max(0, min(10, int(rating * 2 + 0.0001))), "")
+
+@st.cache_resource
+def _event_loop() -> asyncio.AbstractEventLoop:
+    """Start the background event loop shared by all sessions.
+    
+    Streamlit runs each script in its own thread, so network I/O is
+    scheduled onto one long-lived loop instead of a new one per call.
+    
+    Returns:
+        The running event loop
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="rahalah-io", daemon=True).start()
+    return loop
+
+def _run(coro: Any) -> Any:
+    """Run a coroutine on the background event loop and wait for its result.
+    
+    Args:
+        coro: The coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop()).result()
+
+@st.cache_resource
+def _aio_session() -> aiohttp.ClientSession:
+    """Create the pooled HTTP session used for all backend calls.
     
-    stars = "★" * full_stars
-    if half_star:
-        stars += "½"
+    Returns:
+        An aiohttp session bound to the background event loop
+    """
+    async def _create() -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(
+            headers={"Accept-Encoding": "gzip, deflate", "Content-Type": "application/json"},
+            timeout=aiohttp.ClientTimeout(total=30),
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+        )
     
-    return stars
+    return _run(_create())
+
+async def _send_async(session: aiohttp.ClientSession, payload: Dict[str, Any]) -> Tuple[int, Union[Dict[str, Any], str]]:
+    """Post a chat payload to the backend API.
+    
+    Args:
+        session: The shared aiohttp session
+        payload: The request body
+        
+    Returns:
+        Tuple of status code and the decoded JSON body (or raw text on error)
+    """
+    async with session.post(
+        f"{API_URL}/api/chat",
+        data=_json_dumps(payload),
+        headers={"X-Session-Id": payload["session_id"]}
+    ) as response:
+        if response.status == 200:
+            return response.status, _json_loads(await response.read())
+        return response.status, await response.text()
+
+async def _warm_up_async(session: aiohttp.ClientSession) -> None:
+    """Hit the backend health check so it is warm before the first message.
+    
+    Args:
+        session: The shared aiohttp session
+    """
+    try:
+        async with session.get(f"{API_URL}/", timeout=aiohttp.ClientTimeout(total=5)) as response:
+            await response.read()
+    except Exception:
+        pass  # Best effort; a cold or unreachable backend surfaces on the first real request
+
+def _dlog(msg_fn: Callable[[], str]) -> None:
+    """Add a debug log entry if the debug panel is enabled.
+    
+    The message is built lazily so that expensive log strings (such as
+    full response dumps) cost nothing while the panel is off.
+    
+    Args:
+        msg_fn: Callable returning the log message
+    """
+    if st.session_state.get("show_debug"):
+        if 'debug' not in st.session_state:
+            st.session_state.debug = collections.deque(maxlen=DEBUG_LOG_SIZE)
+        st.session_state.debug.append(msg_fn())
 
 def send_message_to_api(message: str, mode: str, conversation_id: Optional[str] = None) -> Dict[str, Any]:
     """Send a message to the backend API.
@@ -127,6 +288,19 @@ def send_message_to_api(message: str, mode: str, conversation_id: Optional[str]
     Returns:
         API response as a dictionary
     """
+    return _send_message(message, mode, conversation_id)[1]
+
+def _send_message(message: str, mode: str, conversation_id: Optional[str] = None) -> Tuple[bool, Dict[str, Any]]:
+    """Send a message to the backend API and report whether it succeeded.
+    
+    Args:
+        message: User's message
+        mode: The mode (flight, hotel, trip)
+        conversation_id: Optional conversation ID for context
+        
+    Returns:
+        Tuple of a success flag and the API response (or error reply) as a dictionary
+    """
     try:
         # Format payload exactly as expected by the backend API
         # The MessageRequest model in backend expects: message, session_id, mode
@@ -138,37 +312,231 @@ def send_message_to_api(message: str, mode: str, conversation_id: Optional[str]
         }
         
         # Add debugging information
-        if 'debug' not in st.session_state:
-            st.session_state.debug = []
-        
-        st.session_state.debug.append(f"Sending request to {API_URL}/api/chat: {json.dumps(payload)}")
+        _dlog(lambda: f"Sending request to {API_URL}/api/chat: {_json_dumps(payload).decode()}")
         
         # Make the API request
-        response = requests.post(
-            f"{API_URL}/api/chat",
-            json=payload,
-            headers={"Content-Type": "application/json"}
-        )
+        status_code, data = _run(_send_async(_aio_session(), payload))
         
-        if response.status_code == 200:
-            data = response.json()
+        if status_code == 200:
             # Add debugging info
-            if 'debug' in st.session_state:
-                st.session_state.debug.append(f"API Response: {json.dumps(data)}")
-            return data
+            _dlog(lambda: f"API Response: {_json_dumps(data).decode()}")
+            return True, data
         else:
-            error_msg = f"API Error: {response.status_code} - {response.text}"
-            if 'debug' in st.session_state:
-                st.session_state.debug.append(error_msg)
+            error_msg = f"API Error: {status_code} - {data}"
+            _dlog(lambda: error_msg)
             st.error(error_msg)
-            return {"response": f"Error: Unable to get response from the assistant. Status code: {response.status_code}"}
+            return False, {"response": f"Error: Unable to get response from the assistant. Status code: {status_code}"}
+    
+    except Exception as e:
+        error_msg = f"Error communicating with the API: {str(e)}"
+        _dlog(lambda: error_msg)
+        st.error(error_msg)
+        return False, {"response": f"Error: {str(e)}"}
+
+async def _open_stream_async(session: aiohttp.ClientSession, payload: Dict[str, Any]) -> aiohttp.ClientResponse:
+    """Open a streaming chat request against the backend API.
+    
+    Args:
+        session: The shared aiohttp session
+        payload: The request body
+        
+    Returns:
+        The open response; the caller must release it
+    """
+    # Long generations may exceed the session's total timeout, so only bound the gap between chunks
+    return await session.post(
+        f"{API_URL}/api/chat/stream",
+        data=_json_dumps(payload),
+        headers={"Accept": "text/event-stream", "X-Session-Id": payload["session_id"]},
+        timeout=aiohttp.ClientTimeout(total=None, sock_read=30)
+    )
+
+async def _iter_sse_async(response: aiohttp.ClientResponse) -> AsyncIterator[Dict[str, Any]]:
+    """Decode the JSON payloads of a Server-Sent Events response.
+    
+    Args:
+        response: The open streaming response
+        
+    Yields:
+        One dictionary per ``data:`` event
+    """
+    buffer = b""
+    async for chunk in response.content.iter_any():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if not line.startswith(b"data: "):
+                continue
+            data = line[6:].strip()
+            if data == b"[DONE]":
+                return
+            yield _json_loads(data)
+
+async def _release_async(response: aiohttp.ClientResponse) -> None:
+    """Return a response's connection to the pool.
+    
+    Args:
+        response: The response to release
+    """
+    response.release()
+
+def _iter_sync(agen: AsyncIterator[Any]) -> Iterator[Any]:
+    """Drive an async iterator on the background event loop from sync code.
+    
+    Args:
+        agen: The async iterator to consume
+        
+    Yields:
+        The items produced by the async iterator
+    """
+    while True:
+        try:
+            yield _run(agen.__anext__())
+        except StopAsyncIteration:
+            return
+
+@st.cache_resource
+def _backend_features() -> Dict[str, bool]:
+    """Track which optional backend endpoints are available, process-wide.
+    
+    Returns:
+        Mutable flags, updated once an endpoint turns out to be missing
+    """
+    return {"stream": True}
+
+def _fallback_to_chat(message: str, mode: str, conversation_id: Optional[str], result: Dict[str, Any]) -> str:
+    """Fetch the reply from the non-streaming endpoint.
+    
+    Args:
+        message: User's message
+        mode: The mode (flight, hotel, trip)
+        conversation_id: Optional conversation ID for context
+        result: Dictionary filled with the response data; "complete" is set
+            to True if the request succeeded
+        
+    Returns:
+        The full reply text
+    """
+    ok, data = _send_message(message, mode, conversation_id)
+    result.update(data)
+    if ok:
+        result["complete"] = True
+    return result.get("response", "")
+
+def stream_message_to_api(message: str, mode: str, conversation_id: Optional[str], result: Dict[str, Any]) -> Iterator[str]:
+    """Stream the assistant's reply from the backend API.
+    
+    The backend sends Server-Sent Events whose data is JSON: events with a
+    ``delta`` carry reply text, any other fields (session_id, search_results,
+    ...) are metadata. If the backend has no streaming endpoint, the reply
+    is fetched with send_message_to_api and yielded in one piece, and
+    later calls skip the streaming attempt.
+    
+    Args:
+        message: User's message
+        mode: The mode (flight, hotel, trip)
+        conversation_id: Optional conversation ID for context
+        result: Dictionary filled with the response metadata and the full
+            reply under "response", in the same shape send_message_to_api returns.
+            "complete" is set to True only if the reply finished cleanly
+            (``[DONE]`` or end of stream, or a successful fallback request)
+        
+    Yields:
+        Chunks of the assistant's reply
+    """
+    features = _backend_features()
+    if not features["stream"]:
+        yield _fallback_to_chat(message, mode, conversation_id, result)
+        return
+    
+    payload = {
+        "message": message,
+        "session_id": conversation_id if conversation_id else "",  # Empty string if None
+        "mode": mode
+    }
     
+    _dlog(lambda: f"Streaming request to {API_URL}/api/chat/stream: {_json_dumps(payload).decode()}")
+    
+    chunks = []
+    try:
+        response = _run(_open_stream_async(_aio_session(), payload))
     except Exception as e:
         error_msg = f"Error communicating with the API: {str(e)}"
-        if 'debug' in st.session_state:
-            st.session_state.debug.append(error_msg)
+        _dlog(lambda: error_msg)
         st.error(error_msg)
-        return {"response": f"Error: {str(e)}"}
+        result["response"] = f"Error: {str(e)}"
+        yield result["response"]
+        return
+    
+    try:
+        if response.status in (404, 405):
+            # Backend without streaming support: use the regular endpoint from now on
+            features["stream"] = False
+            _dlog(lambda: "Streaming endpoint unavailable, falling back to /api/chat")
+            yield _fallback_to_chat(message, mode, conversation_id, result)
+            return
+        
+        if response.status != 200:
+            error_msg = f"API Error: {response.status} - {_run(response.text())}"
+            _dlog(lambda: error_msg)
+            st.error(error_msg)
+            result["response"] = f"Error: Unable to get response from the assistant. Status code: {response.status}"
+            yield result["response"]
+            return
+        
+        for event in _iter_sync(_iter_sse_async(response)):
+            delta = event.pop("delta", None)
+            result.update(event)
+            if delta:
+                chunks.append(delta)
+                yield delta
+        
+        _dlog(lambda: f"Stream finished with metadata keys: {list(result.keys())}")
+        result["complete"] = True
+    
+    except Exception as e:
+        error_msg = f"Error while streaming from the API: {str(e)}"
+        _dlog(lambda: error_msg)
+        st.error(error_msg)
+    
+    finally:
+        _run(_release_async(response))
+    
+    result["response"] = "".join(chunks)
+
+def _coalesce(src: Iterator[str], window_ms: int = STREAM_FLUSH_MS, max_chunks: int = STREAM_FLUSH_CHUNKS) -> Iterator[str]:
+    """Batch streamed chunks so the page is not re-rendered for every token.
+    
+    Args:
+        src: Iterator of reply chunks
+        window_ms: Max time in milliseconds to buffer chunks
+        max_chunks: Max number of chunks to buffer
+        
+    Yields:
+        Joined chunks, at most one per window
+    """
+    buf = []
+    t0 = time.monotonic()
+    for chunk in src:
+        buf.append(chunk)
+        if (time.monotonic() - t0) * 1000 >= window_ms or len(buf) >= max_chunks:
+            yield "".join(buf)
+            buf.clear()
+            t0 = time.monotonic()
+    
+    if buf:
+        yield "".join(buf)
+
+def _esc(value: Any) -> str:
+    """Escape a backend value for use inside result card HTML.
+    
+    Args:
+        value: The value to escape
+        
+    Returns:
+        HTML-safe string
+    """
+    return html.escape(str(value))
 
 def display_flight_results(flights: List[Dict[str, Any]]) -> None:
     """Display flight search results.
@@ -181,25 +549,28 @@ def display_flight_results(flights: List[Dict[str, Any]]) -> None:
         return
     
     for flight in flights:
-        with st.container():
-            col1, col2, col3 = st.columns([2, 2, 1])
-            
-            with col1:
-                st.markdown(f"### {flight.get('airline', 'Unknown Airline')}")
-                st.write(f"**From** {flight.get('origin', 'Origin')} **to** {flight.get('destination', 'Destination')}")
-                st.write(f"**Duration:** {flight.get('duration', 'N/A')}")
-            
-            with col2:
-                st.write("**Departure:** " + flight.get('departure_time', 'N/A'))
-                st.write("**Arrival:** " + flight.get('arrival_time', 'N/A'))
-                st.write(f"**Stops:** {flight.get('stops', 0)}")
-            
-            with col3:
-                st.markdown(f"### {flight.get('formatted_price', flight.get('price', 'N/A'))}")
-                if flight.get('booking_link'):
-                    st.markdown(f"[Book Now]({flight.get('booking_link')})")
-            
-            st.markdown("---")
+        booking_link = flight.get('booking_link')
+        
+        booking_html = ""
+        if booking_link:
+            booking_html = f"<div><a href='{_esc(booking_link)}' target='_blank'>Book Now</a></div>"
+        
+        card = (
+            "<div class='search-result'>"
+            "<div class='search-result-header'>"
+            f"<span class='search-result-title'>{_esc(flight.get('airline', 'Unknown Airline'))}</span>"
+            f"<span class='search-result-price'>{_esc(flight.get('formatted_price', flight.get('price', 'N/A')))}</span>"
+            "</div>"
+            f"<div><span class='info-label'>From</span> {_esc(flight.get('origin', 'Origin'))} "
+            f"<span class='info-label'>to</span> {_esc(flight.get('destination', 'Destination'))}</div>"
+            f"<div><span class='info-label'>Duration:</span> {_esc(flight.get('duration', 'N/A'))}</div>"
+            f"<div><span class='info-label'>Departure:</span> {_esc(flight.get('departure_time', 'N/A'))}</div>"
+            f"<div><span class='info-label'>Arrival:</span> {_esc(flight.get('arrival_time', 'N/A'))}</div>"
+            f"<div><span class='info-label'>Stops:</span> {_esc(flight.get('stops', 0))}</div>"
+            f"{booking_html}"
+            "</div>"
+        )
+        st.markdown(card, unsafe_allow_html=True)
 
 def display_hotel_results(hotels: List[Dict[str, Any]]) -> None:
     """Display hotel search results.
@@ -212,29 +583,34 @@ def display_hotel_results(hotels: List[Dict[str, Any]]) -> None:
         return
     
     for hotel in hotels:
-        with st.container():
-            col1, col2 = st.columns([3, 1])
-            
-            with col1:
-                st.markdown(f"### {hotel.get('title', 'Unknown Hotel')}")
-                stars = display_stars(hotel.get('rating_stars', 0))
-                st.markdown(f"<span class='stars'>{stars}</span>", unsafe_allow_html=True)
-                st.write(f"**Location:** {hotel.get('address', hotel.get('location', 'N/A'))}")
-                
-                if hotel.get('amenities'):
-                    st.write("**Amenities:**")
-                    amenities_html = "<div class='amenities'>"
-                    for amenity in hotel.get('amenities', []):
-                        amenities_html += f"<span class='amenity-tag'>{amenity}</span>"
-                    amenities_html += "</div>"
-                    st.markdown(amenities_html, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"### {hotel.get('formatted_price', hotel.get('price', 'N/A'))}")
-                if hotel.get('booking_link'):
-                    st.markdown(f"[Book Now]({hotel.get('booking_link')})")
-            
-            st.markdown("---")
+        amenities = hotel.get('amenities')
+        booking_link = hotel.get('booking_link')
+        
+        amenities_html = ""
+        if amenities:
+            amenities_html = (
+                "<div class='info-label'>Amenities:</div><div class='amenities'>"
+                + "".join(f"<span class='amenity-tag'>{_esc(a)}</span>" for a in amenities)
+                + "</div>"
+            )
+        
+        booking_html = ""
+        if booking_link:
+            booking_html = f"<div><a href='{_esc(booking_link)}' target='_blank'>Book Now</a></div>"
+        
+        card = (
+            "<div class='search-result'>"
+            "<div class='search-result-header'>"
+            f"<span class='search-result-title'>{_esc(hotel.get('title', 'Unknown Hotel'))}</span>"
+            f"<span class='search-result-price'>{_esc(hotel.get('formatted_price', hotel.get('price', 'N/A')))}</span>"
+            "</div>"
+            f"<div class='stars'>{display_stars(hotel.get('rating_stars', 0))}</div>"
+            f"<div><span class='info-label'>Location:</span> {_esc(hotel.get('address', hotel.get('location', 'N/A')))}</div>"
+            f"{amenities_html}"
+            f"{booking_html}"
+            "</div>"
+        )
+        st.markdown(card, unsafe_allow_html=True)
 
 def display_place_results(places: List[Dict[str, Any]]) -> None:
     """Display place/attraction search results.
@@ -247,33 +623,113 @@ def display_place_results(places: List[Dict[str, Any]]) -> None:
         return
     
     for place in places:
-        with st.container():
-            col1, col2 = st.columns([3, 1])
-            
-            with col1:
-                st.markdown(f"### {place.get('title', 'Unknown Attraction')}")
-                stars = display_stars(place.get('rating_stars', 0))
-                ratings_count = place.get('rating_count', 0)
-                st.markdown(f"<span class='stars'>{stars}</span> ({ratings_count} reviews)", unsafe_allow_html=True)
-                st.write(f"**Address:** {place.get('address', 'N/A')}")
-                
-                if place.get('categories'):
-                    categories = ", ".join(place.get('categories', []))
-                    st.write(f"**Categories:** {categories}")
-                
-                if place.get('phone'):
-                    st.write(f"**Phone:** {place.get('phone')}")
-            
-            with col2:
-                if place.get('website'):
-                    st.markdown(f"[Visit Website]({place.get('website')})")
-                
-                if place.get('hours'):
-                    with st.expander("Opening Hours"):
-                        for hour in place.get('hours', []):
-                            st.write(f"{hour.get('day')}: {hour.get('open')} - {hour.get('close')}")
-            
-            st.markdown("---")
+        categories = place.get('categories')
+        phone = place.get('phone')
+        website = place.get('website')
+        hours = place.get('hours')
+        
+        details_html = ""
+        if categories:
+            details_html += f"<div><span class='info-label'>Categories:</span> {_esc(', '.join(categories))}</div>"
+        
+        if phone:
+            details_html += f"<div><span class='info-label'>Phone:</span> {_esc(phone)}</div>"
+        
+        if website:
+            details_html += f"<div><a href='{_esc(website)}' target='_blank'>Visit Website</a></div>"
+        
+        if hours:
+            hours_html = "".join(
+                f"<div>{_esc(hour.get('day'))}: {_esc(hour.get('open'))} - {_esc(hour.get('close'))}</div>"
+                for hour in hours
+            )
+            details_html += f"<details><summary>Opening Hours</summary>{hours_html}</details>"
+        
+        card = (
+            "<div class='search-result'>"
+            "<div class='search-result-header'>"
+            f"<span class='search-result-title'>{_esc(place.get('title', 'Unknown Attraction'))}</span>"
+            "</div>"
+            f"<div><span class='stars'>{display_stars(place.get('rating_stars', 0))}</span> "
+            f"({_esc(place.get('rating_count', 0))} reviews)</div>"
+            f"<div><span class='info-label'>Address:</span> {_esc(place.get('address', 'N/A'))}</div>"
+            f"{details_html}"
+            "</div>"
+        )
+        st.markdown(card, unsafe_allow_html=True)
+
+# Result tabs in display order: (search_results key, tab label, renderer)
+TAB_SPECS = (
+    ("flight", "Flights", display_flight_results),
+    ("hotel", "Hotels", display_hotel_results),
+    ("place", "Places to Visit", display_place_results)
+)
+
+def _cache_get(key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+    """Look up a recent assistant response for this session.
+    
+    Args:
+        key: The (mode, message, conversation_id) cache key
+        
+    Returns:
+        The cached response data, or None if missing or expired
+    """
+    cache = st.session_state.response_cache
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    
+    stored_at, data = entry
+    if time.monotonic() - stored_at > RESPONSE_CACHE_TTL:
+        del cache[key]
+        return None
+    
+    cache.move_to_end(key)
+    return data
+
+def _cache_put(key: Tuple[str, str, str], data: Dict[str, Any]) -> None:
+    """Store an assistant response, evicting the least recently used one if full.
+    
+    Args:
+        key: The (mode, message, conversation_id) cache key
+        data: The response data
+    """
+    cache = st.session_state.response_cache
+    cache[key] = (time.monotonic(), data)
+    cache.move_to_end(key)
+    while len(cache) > RESPONSE_CACHE_SIZE:
+        cache.popitem(last=False)
+
+# Chat message templates; content must be HTML-escaped before formatting
+_USER_TMPL = "<div class='chat-message user'><p>{content}</p></div>".format
+_ASSIST_TMPL = "<div class='chat-message assistant'><p>{content}</p></div>".format
+
+def append_message(container: Any, role: str, content: str) -> None:
+    """Render a single chat message into a container.
+    
+    Args:
+        container: The Streamlit container or placeholder to write to
+        role: The message role (user or assistant)
+        content: The message text
+    """
+    template = _USER_TMPL if role == "user" else _ASSIST_TMPL
+    container.markdown(template(content=html.escape(content)), unsafe_allow_html=True)
+
+def render_results(container: Any, search_results: Dict[str, Any]) -> None:
+    """Render the search results tabs into a placeholder.
+    
+    Args:
+        container: The st.empty placeholder holding the results
+        search_results: Search results keyed by result type
+    """
+    with container.container():
+        st.markdown("## Search Results")
+        
+        active = [(label, renderer, search_results[key]) for key, label, renderer in TAB_SPECS if key in search_results]
+        if active:
+            for tab, (_, renderer, data) in zip(st.tabs([label for label, _, _ in active]), active):
+                with tab:
+                    renderer(data)
 
 def init_session_state():
     """Initialize session state variables if they don't exist."""
@@ -290,13 +746,26 @@ def init_session_state():
         st.session_state.search_results = {}
         
     if 'debug' not in st.session_state:
-        st.session_state.debug = []
+        st.session_state.debug = collections.deque(maxlen=DEBUG_LOG_SIZE)
         
     if 'show_debug' not in st.session_state:
         st.session_state.show_debug = False
+    
+    if 'response_cache' not in st.session_state:
+        st.session_state.response_cache = collections.OrderedDict()
+    
+    if 'use_response_cache' not in st.session_state:
+        st.session_state.use_response_cache = True
+    
+    # Warm up the backend in the background while the user is typing
+    if not st.session_state.get('warmed'):
+        asyncio.run_coroutine_threadsafe(_warm_up_async(_aio_session()), _event_loop())
+        st.session_state.warmed = True
 
 def main():
     """Main application function."""
+    _inject_css()
+    
     # Initialize session state
     init_session_state()
     
@@ -305,11 +774,16 @@ def main():
     
     # Debug toggle in sidebar
     with st.sidebar:
+        st.session_state.use_response_cache = st.checkbox(
+            "Reuse recent answers",
+            value=st.session_state.use_response_cache,
+            help=f"Answer repeated questions from the last {RESPONSE_CACHE_TTL} seconds without calling the backend"
+        )
         st.session_state.show_debug = st.checkbox("Show Debug Panel", value=st.session_state.show_debug)
         
         if st.session_state.show_debug:
             if st.button("Clear Debug Logs"):
-                st.session_state.debug = []
+                st.session_state.debug.clear()
                 
     # Show debug panel if enabled
     if st.session_state.show_debug:
@@ -319,7 +793,18 @@ def main():
             st.write(f"Conversation ID: {st.session_state.conversation_id}")
             
             if st.session_state.debug:
-                for i, log in enumerate(st.session_state.debug):
+                logs = list(st.session_state.debug)
+                start = max(0, len(logs) - DEBUG_LOG_SHOWN)
+                
+                # Expanders can't be nested, so older entries are behind a toggle.
+                # The label stays fixed so the toggle keeps its state as the log grows.
+                if start:
+                    st.caption(f"{start} older entries hidden")
+                    if st.checkbox("Show older entries", key="show_older_debug"):
+                        for i, log in enumerate(logs[:start]):
+                            st.text(f"{i+1}. {log}")
+                
+                for i, log in enumerate(logs[start:], start):
                     st.text(f"{i+1}. {log}")
             else:
                 st.info("No debug logs yet.")
@@ -328,8 +813,8 @@ def main():
     st.sidebar.title("Mode Selection")
     selected_mode = st.sidebar.radio(
         "Choose Mode",
-        ["trip", "flight", "hotel"],
-        index=["trip", "flight", "hotel"].index(st.session_state.mode)
+        MODES,
+        index=MODE_INDEX[st.session_state.mode]
     )
     
     if selected_mode != st.session_state.mode:
@@ -340,127 +825,98 @@ def main():
     
     # Sidebar for sample queries
     st.sidebar.title("Sample Queries")
-    sample_queries = {
-        "trip": [
-            "Plan a 7-day trip to Riyadh",
-            "What's a good itinerary for a weekend in Jeddah?",
-            "Suggest activities for a family vacation in Mecca"
-        ],
-        "flight": [
-            "Find flights from Riyadh to Jeddah next weekend",
-            "What are the cheapest flights to Madinah in July?",
-            "Show me business class options from Riyadh to Dubai"
-        ],
-        "hotel": [
-            "Find hotels in Riyadh near Kingdom Centre",
-            "What are the best 5-star hotels in Jeddah?",
-            "Show me family-friendly accommodations in Mecca"
-        ]
-    }
-    
-    for query in sample_queries.get(st.session_state.mode, []):
+    # Clicked sample queries are processed below the conversation history
+    pending_query = None
+    for query in SAMPLE_QUERIES_BY_MODE.get(st.session_state.mode, ()):
         if st.sidebar.button(query, key=query):
             st.session_state.user_input = query
-            process_user_input(query)
+            pending_query = query
     
     # Display conversation history
+    msg_container = st.container()
+    welcome = msg_container.empty()
     if st.session_state.messages:
         for message in st.session_state.messages:
-            role = message.get("role", "")
-            content = message.get("content", "")
-            
-            if role == "user":
-                st.markdown(f"<div class='chat-message user'><p>{content}</p></div>", unsafe_allow_html=True)
-            else:
-                st.markdown(f"<div class='chat-message assistant'><p>{content}</p></div>", unsafe_allow_html=True)
+            append_message(msg_container, message.get("role", ""), message.get("content", ""))
     else:
         # Welcome message
-        if st.session_state.mode == "trip":
-            st.info("Welcome to Rahalah! Ask me to plan a trip for you, and I'll help with flights, hotels, and places to visit.")
-        elif st.session_state.mode == "flight":
-            st.info("Welcome to Rahalah Flight Search! Tell me where you want to fly from and to, and I'll find the best options.")
-        elif st.session_state.mode == "hotel":
-            st.info("Welcome to Rahalah Hotel Search! Tell me where you're looking to stay, and I'll find great accommodation options.")
+        welcome.info(WELCOME[st.session_state.mode])
     
     # Display search results if available
+    results_container = st.empty()
     if st.session_state.search_results:
-        st.markdown("## Search Results")
-        
-        tabs = []
-        if "flight" in st.session_state.search_results:
-            tabs.append("Flights")
-        if "hotel" in st.session_state.search_results:
-            tabs.append("Hotels")
-        if "place" in st.session_state.search_results:
-            tabs.append("Places to Visit")
-        
-        if tabs:
-            selected_tab = st.tabs(tabs)
-            
-            tab_index = 0
-            if "flight" in st.session_state.search_results:
-                with selected_tab[tab_index]:
-                    display_flight_results(st.session_state.search_results.get("flight", []))
-                tab_index += 1
-            
-            if "hotel" in st.session_state.search_results:
-                with selected_tab[tab_index]:
-                    display_hotel_results(st.session_state.search_results.get("hotel", []))
-                tab_index += 1
-            
-            if "place" in st.session_state.search_results:
-                with selected_tab[tab_index]:
-                    display_place_results(st.session_state.search_results.get("place", []))
+        render_results(results_container, st.session_state.search_results)
     
     # User input for chat
-    user_input = st.chat_input("Type your travel query...")
+    user_input = st.chat_input("Type your travel query...") or pending_query
     if user_input:
-        process_user_input(user_input)
+        welcome.empty()
+        process_user_input(user_input, msg_container, results_container)
 
-def process_user_input(user_input: str) -> None:
-    """Process user input, send to API, and update UI.
+def process_user_input(user_input: str, msg_container: Any, results_container: Any) -> None:
+    """Process user input, send to API, and update UI in place.
     
     Args:
         user_input: The user's input message
+        msg_container: The container holding the conversation history
+        results_container: The placeholder holding the search results
     """
     # Add debug log
-    if 'debug' in st.session_state:
-        st.session_state.debug.append(f"Processing user input: {user_input}")
-        st.session_state.debug.append(f"Current mode: {st.session_state.mode}")
+    _dlog(lambda: f"Processing user input: {user_input}")
+    _dlog(lambda: f"Current mode: {st.session_state.mode}")
     
-    # Add user message to chat history
+    # Add user message to chat history and show it right away
     user_message = {"role": "user", "content": user_input}
     st.session_state.messages.append(user_message)
+    append_message(msg_container, "user", user_input)
     
-    # Get response from the API
-    response_data = send_message_to_api(
-        user_input,
-        st.session_state.mode,
-        st.session_state.conversation_id
-    )
+    # Reuse a recent answer to the same question; the first turn of a conversation is never cached
+    cache_key = (st.session_state.mode, user_input, st.session_state.conversation_id)
+    use_cache = st.session_state.use_response_cache and bool(st.session_state.conversation_id)
+    cached = _cache_get(cache_key) if use_cache else None
+    
+    response_data: Dict[str, Any]
+    placeholder = msg_container.empty()
+    if cached is not None:
+        _dlog(lambda: f"Using cached response for: {user_input}")
+        response_data = dict(cached)
+    else:
+        # Stream the response from the API as it is generated
+        response_data = {}
+        placeholder.write_stream(_coalesce(stream_message_to_api(
+            user_input,
+            st.session_state.mode,
+            st.session_state.conversation_id,
+            response_data
+        )))
+        
+        # Only cache replies that finished cleanly, never errors or cut-off streams
+        complete = response_data.pop("complete", False)
+        if use_cache and complete:
+            _cache_put(cache_key, dict(response_data))
     
     # Add debug log for response data
-    if 'debug' in st.session_state:
-        st.session_state.debug.append(f"Received response_data keys: {list(response_data.keys() if response_data else [])}")
+    _dlog(lambda: f"Received response_data keys: {list(response_data)}")
+    
+    sid = response_data.get("session_id")
+    resp = response_data.get("response", "")
+    results = response_data.get("search_results") or {}
     
     # Update conversation ID if present
-    if response_data.get("session_id"):
-        st.session_state.conversation_id = response_data.get("session_id")
-        if 'debug' in st.session_state:
-            st.session_state.debug.append(f"Updated conversation_id: {st.session_state.conversation_id}")
+    if sid:
+        st.session_state.conversation_id = sid
+        _dlog(lambda: f"Updated conversation_id: {st.session_state.conversation_id}")
     
     # Add assistant response to chat history
-    assistant_message = {"role": "assistant", "content": response_data.get("response", "")}
+    assistant_message = {"role": "assistant", "content": resp}
     st.session_state.messages.append(assistant_message)
+    append_message(placeholder, "assistant", resp)
     
     # Update search results if present
-    if response_data.get("search_results"):
-        st.session_state.search_results = response_data.get("search_results", {})
-        if 'debug' in st.session_state:
-            st.session_state.debug.append(f"Updated search_results with keys: {list(st.session_state.search_results.keys())}")
-    
-    # Rerun the app to show updated messages and results
-    st.rerun()
+    if results:
+        st.session_state.search_results = results
+        _dlog(lambda: f"Updated search_results with keys: {list(st.session_state.search_results.keys())}")
+        render_results(results_container, st.session_state.search_results)
 
 if __name__ == "__main__":
     main()
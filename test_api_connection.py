@@ -2,13 +2,23 @@
 Rahalah Trip Planning Assistant - API Connection Test
 This script tests the connection between the frontend and backend API.
 """
+import asyncio
+import contextvars
+import io
 import json
-import requests
+import sys
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
+import aiohttp
 import colorama
 from colorama import Fore, Style
 
+# orjson is an optional speedup; fall back to the standard library without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Initialize colorama
 colorama.init()
 
@@ -16,15 +26,58 @@ colorama.init()
 API_URL = "http://localhost:8000"
 FRONTEND_URL = "http://localhost:8501"
 
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize an object to JSON bytes, using orjson when available.
+    
+    Args:
+        obj: The object to serialize
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+def _json_loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON, using orjson when available.
+    
+    Args:
+        data: The JSON document
+        
+    Returns:
+        The parsed object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Output is collected per test and written in one go, so concurrent tests don't interleave
+_BUF: contextvars.ContextVar[io.StringIO] = contextvars.ContextVar("output_buffer", default=io.StringIO())
+
+def _emit(line: str) -> None:
+    """Append a line to the current output buffer.
+    
+    Args:
+        line: The line to write
+    """
+    _BUF.get().write(f"{line}\n")
+
+def flush() -> None:
+    """Write the current output buffer to stdout and clear it."""
+    buf = _BUF.get()
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
+    buf.seek(0)
+    buf.truncate(0)
+
 def print_header(message: str) -> None:
     """Print a formatted header message.
     
     Args:
         message: The message to print
     """
-    print(f"\n{Fore.CYAN}{'=' * 80}")
-    print(f"{Fore.CYAN}{message.center(80)}")
-    print(f"{Fore.CYAN}{'=' * 80}{Style.RESET_ALL}\n")
+    _emit(f"\n{Fore.CYAN}{'=' * 80}\n{Fore.CYAN}{message.center(80)}\n{Fore.CYAN}{'=' * 80}{Style.RESET_ALL}\n")
 
 def print_success(message: str) -> None:
     """Print a success message.
@@ -32,7 +85,7 @@ def print_success(message: str) -> None:
     Args:
         message: The message to print
     """
-    print(f"{Fore.GREEN}✓ {message}{Style.RESET_ALL}")
+    _emit(f"{Fore.GREEN}✓ {message}{Style.RESET_ALL}")
 
 def print_error(message: str) -> None:
     """Print an error message.
@@ -40,7 +93,7 @@ def print_error(message: str) -> None:
     Args:
         message: The message to print
     """
-    print(f"{Fore.RED}✗ {message}{Style.RESET_ALL}")
+    _emit(f"{Fore.RED}✗ {message}{Style.RESET_ALL}")
 
 def print_info(message: str) -> None:
     """Print an info message.
@@ -48,7 +101,7 @@ def print_info(message: str) -> None:
     Args:
         message: The message to print
     """
-    print(f"{Fore.YELLOW}ℹ {message}{Style.RESET_ALL}")
+    _emit(f"{Fore.YELLOW}ℹ {message}{Style.RESET_ALL}")
 
 def print_json(data: Dict[str, Any]) -> None:
     """Print formatted JSON data.
@@ -56,37 +109,119 @@ def print_json(data: Dict[str, Any]) -> None:
     Args:
         data: The data to print
     """
-    json_str = json.dumps(data, indent=2)
-    print(f"{Fore.MAGENTA}{json_str}{Style.RESET_ALL}")
+    if orjson is not None:
+        json_str = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    else:
+        json_str = json.dumps(data, indent=2)
+    _emit(f"{Fore.MAGENTA}{json_str}{Style.RESET_ALL}")
+
+async def _get(session: aiohttp.ClientSession, url: str) -> Tuple[int, str]:
+    """Send a GET request.
+    
+    Args:
+        session: The shared aiohttp session
+        url: The URL to request
+        
+    Returns:
+        Tuple of status code and response body
+    """
+    async with session.get(url) as response:
+        return response.status, await response.text()
 
-def test_health_check() -> bool:
+async def _post(session: aiohttp.ClientSession, url: str, payload: Dict[str, Any]) -> Tuple[int, str]:
+    """Send a JSON POST request.
+    
+    Args:
+        session: The shared aiohttp session
+        url: The URL to post to
+        payload: The JSON body
+        
+    Returns:
+        Tuple of status code and response body
+    """
+    headers = {"Content-Type": "application/json", "X-Session-Id": payload.get("session_id", "")}
+    async with session.post(url, data=_json_dumps(payload), headers=headers) as response:
+        return response.status, await response.text()
+
+async def test_health_check(session: aiohttp.ClientSession) -> bool:
     """Test the health check endpoint.
     
+    Args:
+        session: The shared aiohttp session
+        
     Returns:
         True if the test passes, False otherwise
     """
     print_header("Testing Health Check Endpoint")
     
     try:
-        response = requests.get(f"{API_URL}/")
+        status, text = await _get(session, f"{API_URL}/")
         
-        if response.status_code == 200:
-            data = response.json()
+        if status == 200:
+            data = _json_loads(text)
             print_success(f"Health check successful: {data}")
             return True
         else:
-            print_error(f"Health check failed with status code: {response.status_code}")
-            print_error(f"Response: {response.text}")
+            print_error(f"Health check failed with status code: {status}")
+            print_error(f"Response: {text}")
             return False
     
     except Exception as e:
         print_error(f"Error during health check: {str(e)}")
         return False
 
-def test_chat_api(mode: str, message: str, expected_results_key: Optional[str] = None) -> bool:
+def _check_chat_response(data: Dict[str, Any], expected_results_key: Optional[str] = None) -> bool:
+    """Validate and print a single chat API response.
+    
+    Args:
+        data: The decoded chat response
+        expected_results_key: The expected key in search_results (if any)
+        
+    Returns:
+        True if the response has all expected fields, False otherwise
+    """
+    # Check for expected fields
+    if "response" in data:
+        print_success(f"Response: {data['response']}")
+    else:
+        print_error("Missing 'response' field in API response")
+        return False
+    
+    if "session_id" in data:
+        print_success(f"Session ID: {data['session_id']}")
+    else:
+        print_error("Missing 'session_id' field in API response")
+        return False
+    
+    if "mode" in data:
+        print_success(f"Mode: {data['mode']}")
+    else:
+        print_error("Missing 'mode' field in API response")
+        return False
+    
+    if "search_results" in data:
+        if expected_results_key and expected_results_key in data["search_results"]:
+            results = data["search_results"][expected_results_key]
+            print_success(f"Found {len(results)} {expected_results_key} results")
+            print_info(f"First result preview:")
+    
+            if results:
+                first_result = results[0]
+                print_json(first_result)
+        else:
+            print_info("Search results:")
+            print_json(data["search_results"])
+    else:
+        print_error("Missing 'search_results' field in API response")
+        return False
+    
+    return True
+
+async def test_chat_api(session: aiohttp.ClientSession, mode: str, message: str, expected_results_key: Optional[str] = None) -> bool:
     """Test the chat API endpoint with a specific mode.
     
     Args:
+        session: The shared aiohttp session
         mode: The mode to test (flight, hotel, trip)
         message: The message to send
         expected_results_key: The expected key in search_results (if any)
@@ -105,88 +240,167 @@ def test_chat_api(mode: str, message: str, expected_results_key: Optional[str] =
         }
         
         start_time = time.time()
-        response = requests.post(
-            f"{API_URL}/api/chat",
-            json=payload,
-            headers={"Content-Type": "application/json"}
-        )
+        status, text = await _post(session, f"{API_URL}/api/chat", payload)
         end_time = time.time()
         
         print_info(f"Response time: {end_time - start_time:.2f} seconds")
         
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Check for expected fields
-            if "response" in data:
-                print_success(f"Response: {data['response']}")
-            else:
-                print_error("Missing 'response' field in API response")
-                return False
-            
-            if "session_id" in data:
-                print_success(f"Session ID: {data['session_id']}")
-            else:
-                print_error("Missing 'session_id' field in API response")
-                return False
-            
-            if "mode" in data:
-                print_success(f"Mode: {data['mode']}")
-            else:
-                print_error("Missing 'mode' field in API response")
-                return False
+        if status == 200:
+            data = _json_loads(text)
             
-            if "search_results" in data:
-                if expected_results_key and expected_results_key in data["search_results"]:
-                    results = data["search_results"][expected_results_key]
-                    print_success(f"Found {len(results)} {expected_results_key} results")
-                    print_info(f"First result preview:")
-                    
-                    if results:
-                        first_result = results[0]
-                        print_json(first_result)
-                else:
-                    print_info("Search results:")
-                    print_json(data["search_results"])
-            else:
-                print_error("Missing 'search_results' field in API response")
-                return False
-            
-            return True
+            return _check_chat_response(data, expected_results_key)
         else:
-            print_error(f"API request failed with status code: {response.status_code}")
-            print_error(f"Response: {response.text}")
+            print_error(f"API request failed with status code: {status}")
+            print_error(f"Response: {text}")
             return False
     
     except Exception as e:
         print_error(f"Error during API request: {str(e)}")
         return False
 
-def test_frontend_connection() -> bool:
+async def test_chat_batch(session: aiohttp.ClientSession, cases: List[List[Any]]) -> Optional[List[bool]]:
+    """Test all chat modes with a single batched API request.
+    
+    Args:
+        session: The shared aiohttp session
+        cases: One [mode, message, expected_results_key] entry per mode
+        
+    Returns:
+        One result per case, or None if the backend has no batch endpoint
+    """
+    print_header("Testing Chat Modes (Batched)")
+    
+    try:
+        payloads = [
+            {"message": message, "mode": mode, "session_id": ""}
+            for mode, message, _ in cases
+        ]
+        
+        start_time = time.time()
+        status, text = await _post(session, f"{API_URL}/api/chat/batch", {"requests": payloads})
+        end_time = time.time()
+        
+        if status in (404, 405):
+            print_info("Batch endpoint not available, falling back to one request per mode")
+            return None
+        
+        print_info(f"Response time: {end_time - start_time:.2f} seconds")
+        
+        if status != 200:
+            print_error(f"Batch API request failed with status code: {status}")
+            print_error(f"Response: {text}")
+            return [False] * len(cases)
+        
+        responses = _json_loads(text)["responses"]
+        if len(responses) != len(cases):
+            print_error(f"Expected {len(cases)} responses, got {len(responses)}")
+            return [False] * len(cases)
+        
+        results = []
+        for (mode, message, expected_results_key), data in zip(cases, responses):
+            print_info(f"{mode.upper()} mode, message: '{message}'")
+            results.append(_check_chat_response(data, expected_results_key))
+        return results
+    
+    except Exception as e:
+        print_error(f"Error during batch API request: {str(e)}")
+        return [False] * len(cases)
+
+async def test_frontend_connection(session: aiohttp.ClientSession) -> bool:
     """Test the connection to the Streamlit frontend.
     
+    Args:
+        session: The shared aiohttp session
+        
     Returns:
         True if the test passes, False otherwise
     """
     print_header("Testing Frontend Connection")
     
     try:
-        response = requests.get(FRONTEND_URL)
+        status, _ = await _get(session, FRONTEND_URL)
         
-        if response.status_code == 200:
+        if status == 200:
             print_success(f"Frontend connection successful")
             return True
         else:
-            print_error(f"Frontend connection failed with status code: {response.status_code}")
+            print_error(f"Frontend connection failed with status code: {status}")
             return False
     
     except Exception as e:
         print_error(f"Error connecting to frontend: {str(e)}")
         return False
 
+async def _run_test(session: aiohttp.ClientSession, test: Dict[str, Any]) -> Any:
+    """Run a single connection test.
+    
+    Args:
+        session: The shared aiohttp session
+        test: The test definition (name, function, args)
+        
+    Returns:
+        The test result
+    """
+    _BUF.set(io.StringIO())
+    try:
+        _emit("\n" + "-" * 80)
+        print_info(f"Running test: {test['name']}")
+        return await test["function"](session, *test["args"])
+    finally:
+        flush()
+
+async def _run_chat_tests(session: aiohttp.ClientSession, chat_tests: List[Dict[str, Any]]) -> List[Any]:
+    """Run the chat mode tests as one batched request.
+    
+    Falls back to one request per mode if the backend has no batch endpoint.
+    
+    Args:
+        session: The shared aiohttp session
+        chat_tests: The test_chat_api test definitions
+        
+    Returns:
+        The test results (or raised exceptions), in test order
+    """
+    batch_test = {
+        "name": "Chat Modes (Batched)",
+        "function": test_chat_batch,
+        "args": [[test["args"] for test in chat_tests]]
+    }
+    results = await _run_test(session, batch_test)
+    if results is not None:
+        return results
+    
+    return await asyncio.gather(*(_run_test(session, test) for test in chat_tests), return_exceptions=True)
+
+async def _run_tests(tests: List[Dict[str, Any]]) -> List[Any]:
+    """Run all connection tests concurrently over one session.
+    
+    Args:
+        tests: The test definitions
+        
+    Returns:
+        The test results (or raised exceptions), in test order
+    """
+    chat_tests = [test for test in tests if test["function"] is test_chat_api]
+    other_tests = [test for test in tests if test["function"] is not test_chat_api]
+    
+    async with aiohttp.ClientSession(headers={"Accept-Encoding": "gzip, deflate"}) as session:
+        chat_results, *other_results = await asyncio.gather(
+            _run_chat_tests(session, chat_tests),
+            *(_run_test(session, test) for test in other_tests),
+            return_exceptions=True
+        )
+    
+    if isinstance(chat_results, BaseException):
+        chat_results = [chat_results] * len(chat_tests)
+    
+    results = {test["name"]: result for test, result in zip(chat_tests + other_tests, list(chat_results) + other_results)}
+    return [results[test["name"]] for test in tests]
+
 def run_all_tests() -> None:
     """Run all connection tests."""
     print_header("RAHALAH TRIP PLANNING ASSISTANT - API CONNECTION TEST")
+    flush()
     
     tests = [
         {"name": "Health Check", "function": test_health_check, "args": []},
@@ -196,32 +410,34 @@ def run_all_tests() -> None:
         {"name": "Frontend Connection", "function": test_frontend_connection, "args": []}
     ]
     
+    # The tests are independent, so run them concurrently
     results = {}
     
-    for test in tests:
-        print("\n" + "-" * 80)
-        print_info(f"Running test: {test['name']}")
-        result = test["function"](*test["args"])
+    for test, result in zip(tests, asyncio.run(_run_tests(tests))):
+        if isinstance(result, BaseException):
+            print_error(f"{test['name']} raised: {result}")
+            result = False
         results[test["name"]] = result
     
-    print("\n" + "=" * 80)
-    print(f"{Fore.CYAN}TEST SUMMARY".center(80))
-    print("=" * 80)
+    _emit("\n" + "=" * 80)
+    _emit(f"{Fore.CYAN}TEST SUMMARY".center(80))
+    _emit("=" * 80)
     
     all_passed = True
     for name, result in results.items():
         if result:
-            print(f"{Fore.GREEN}✓ {name}: PASSED{Style.RESET_ALL}")
+            _emit(f"{Fore.GREEN}✓ {name}: PASSED{Style.RESET_ALL}")
         else:
-            print(f"{Fore.RED}✗ {name}: FAILED{Style.RESET_ALL}")
+            _emit(f"{Fore.RED}✗ {name}: FAILED{Style.RESET_ALL}")
             all_passed = False
     
-    print("\n" + "=" * 80)
+    _emit("\n" + "=" * 80)
     if all_passed:
-        print(f"{Fore.GREEN}ALL TESTS PASSED! Frontend and Backend are properly connected.{Style.RESET_ALL}")
+        _emit(f"{Fore.GREEN}ALL TESTS PASSED! Frontend and Backend are properly connected.{Style.RESET_ALL}")
     else:
-        print(f"{Fore.RED}SOME TESTS FAILED. Please check the errors above.{Style.RESET_ALL}")
-    print("=" * 80 + "\n")
+        _emit(f"{Fore.RED}SOME TESTS FAILED. Please check the errors above.{Style.RESET_ALL}")
+    _emit("=" * 80 + "\n")
+    flush()
 
 if __name__ == "__main__":
     run_all_tests()